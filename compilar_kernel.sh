@@ -0,0 +1,5 @@
+#!/bin/sh
+# Compila el núcleo en C del modo rápido (opcional: sin él se usa Numba o NumPy).
+# verificador_goldbach.py carga goldbach_kernel.so si está junto a él.
+cd "$(dirname "$0")"
+${CC:-cc} -O3 -march=native -shared -fPIC goldbach_kernel.c -o goldbach_kernel.so
@@ -0,0 +1,112 @@
+/*
+ * ═══════════════════════════════════════════════════════════════════════════
+ *            NÚCLEO EN C DEL VERIFICADOR GOLDBACH (MODO RÁPIDO)
+ * ═══════════════════════════════════════════════════════════════════════════
+ *
+ * Busca los n pares de [lo, hi] SIN ninguna representación n = p + q,
+ * trabajando directamente sobre el mapa de primos empaquetado (bit k en la
+ * palabra k >> 6, posición k & 63, igual que bits_primos en Python).
+ *
+ * Para cada primo p se hace un OR del mapa desplazado p posiciones sobre el
+ * mapa "tiene_rep" de la ventana: el bit n queda encendido si n - p es
+ * primo. Se procesan 64 números por instrucción y se corta en cuanto todos
+ * los pares de la ventana tienen representación (casi siempre con p < 100).
+ *
+ * Compilar (ver compilar_kernel.sh):
+ *     cc -O3 -march=native -shared -fPIC goldbach_kernel.c -o goldbach_kernel.so
+ * ═══════════════════════════════════════════════════════════════════════════
+ */
+
+#include <stdint.h>
+#include <stdlib.h>
+
+/* Bits de las posiciones pares de una palabra (n = 64w + k es par si k lo es) */
+#define PARES 0x5555555555555555ULL
+
+/* 64 bits del mapa a partir de la posición s (que puede ser negativa) */
+static inline uint64_t leer_palabra(const uint64_t *bits, int64_t s)
+{
+    int64_t w = s >> 6;             /* división por defecto, también si s < 0 */
+    int b = (int)(s & 63);
+    uint64_t bajo = (w >= 0) ? bits[w] : 0;
+    if (b == 0)
+        return bajo;
+    uint64_t alto = (w + 1 >= 0) ? bits[w + 1] : 0;
+    return (bajo >> b) | (alto << (64 - b));
+}
+
+/*
+ * Args:
+ *     bits: Mapa de primos empaquetado, que cubre al menos 0..hi
+ *     lo, hi: Rango de n a verificar (solo cuentan los pares, lo >= 4)
+ *     salida: Donde escribir los contraejemplos encontrados
+ *     max_salida: Capacidad de salida
+ *
+ * Returns:
+ *     Número de contraejemplos (se escriben como mucho max_salida),
+ *     o -1 si no hay memoria
+ */
+int64_t goldbach_contraejemplos(const uint64_t *bits, int64_t lo, int64_t hi,
+                                int64_t *salida, int64_t max_salida)
+{
+    if (lo > hi)
+        return 0;
+
+    int64_t w_lo = lo >> 6, w_hi = hi >> 6;
+    int64_t num_palabras = w_hi - w_lo + 1;
+    uint64_t *tiene_rep = calloc((size_t)num_palabras, sizeof(uint64_t));
+    uint64_t *objetivo = malloc((size_t)num_palabras * sizeof(uint64_t));
+    if (tiene_rep == NULL || objetivo == NULL) {
+        free(tiene_rep);
+        free(objetivo);
+        return -1;
+    }
+
+    /* Bits a cubrir: los pares de [lo, hi] (recortando la primera y la última palabra) */
+    for (int64_t i = 0; i < num_palabras; i++)
+        objetivo[i] = PARES;
+    objetivo[0] &= ~0ULL << (lo & 63);
+    objetivo[num_palabras - 1] &= ~0ULL >> (63 - (hi & 63));
+
+    /* Ventana [primera, ultima] de palabras aún incompletas: se encoge sola */
+    int64_t primera = 0, ultima = num_palabras - 1;
+    int64_t mitad = hi >> 1;
+
+    for (int64_t wp = 0; wp <= (mitad >> 6) && primera <= ultima; wp++) {
+        uint64_t palabra_primos = bits[wp];
+        while (palabra_primos && primera <= ultima) {
+            int64_t p = (wp << 6) + __builtin_ctzll(palabra_primos);
+            palabra_primos &= palabra_primos - 1;
+            if (p > mitad)
+                break;
+
+            /* tiene_rep[n] |= es_primo[n - p] para toda la ventana */
+            for (int64_t i = primera; i <= ultima; i++)
+                tiene_rep[i] |= leer_palabra(bits, ((w_lo + i) << 6) - p);
+
+            while (primera <= ultima && (tiene_rep[primera] & objetivo[primera]) == objetivo[primera])
+                primera++;
+            while (ultima >= primera && (tiene_rep[ultima] & objetivo[ultima]) == objetivo[ultima])
+                ultima--;
+        }
+    }
+
+    /* Contraejemplos: bits pares que siguen apagados */
+    int64_t total = 0;
+    for (int64_t i = primera; i <= ultima; i++) {
+        uint64_t sin_rep = objetivo[i] & ~tiene_rep[i];
+        total += __builtin_popcountll(sin_rep);
+        while (sin_rep) {
+            int64_t n = ((w_lo + i) << 6) + __builtin_ctzll(sin_rep);
+            sin_rep &= sin_rep - 1;
+            if (max_salida > 0) {
+                *salida++ = n;
+                max_salida--;
+            }
+        }
+    }
+
+    free(tiene_rep);
+    free(objetivo);
+    return total;
+}
@@ -21,7 +21,9 @@ ADVERTENCIA: Esto eliminará TODO el progreso guardado.
 import os
 
 archivos_a_eliminar = [
+    "progreso_goldbach.bin",
     "progreso_goldbach.json",
+    "contraejemplos_goldbach.log",
     "log_goldbach.txt",
     "resultados_test_1.txt",
     "resultados.txt",
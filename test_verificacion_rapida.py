@@ -10,32 +10,57 @@ Este script ejecuta una verificación RÁPIDA para asegurarse de que
 el código funciona correctamente después de las correcciones.
 
 Verifica solo los primeros 1000 números pares (hasta n=2000).
+
+Además compara las funciones de verificador_goldbach.py con la criba
+simple de este archivo, usada como oráculo.
 ═══════════════════════════════════════════════════════════════════════════
 """
 
+import os
 import math
+import random
+import tempfile
 import time
+from contextlib import contextmanager
+from itertools import islice
+
+import numpy as np
+
+import verificador_goldbach as vg
+
+# Límites del oráculo: el conteo por fuerza bruta es O(n²/ln²n)
+N_CONTEO = 3 * 10**4
+N_PRIMER_PAR = 10**5
+
+# Segmentos de criba pequeños: muchos segmentos y bordes incluso con n chico
+SEGMENTO_PEQUEÑO = 1000
+
 
 def criba_eratostenes_simple(limite):
     """Criba simple para generar primos hasta 'limite'."""
     if limite < 2:
         return []
     
-    es_primo = [True] * (limite + 1)
-    es_primo[0] = es_primo[1] = False
+    # bytearray: 1 byte por número (no un puntero a bool de 8 bytes) y
+    # tachado con asignación por slice, que hace el bucle en C
+    es_primo = bytearray([1]) * (limite + 1)
+    es_primo[0] = es_primo[1] = 0
     
-    for i in range(2, int(math.sqrt(limite)) + 1):
+    for i in range(2, math.isqrt(limite) + 1):
         if es_primo[i]:
-            for j in range(i*i, limite + 1, i):
-                es_primo[j] = False
+            es_primo[i*i::i] = bytes(len(range(i*i, limite + 1, i)))
     
-    return [i for i in range(limite + 1) if es_primo[i]]
+    return [i for i, marca in enumerate(es_primo) if marca]
 
 
-def verificar_goldbach_numero(n, set_primos):
+def verificar_goldbach_numero(n, primos_mitad, es_primo):
     """
     Verifica si un número par n cumple Goldbach.
     
+    primos_mitad son solo los primos ≤ n/2 (por simetría), así que el bucle
+    no necesita comparar cada p con n/2. La pertenencia de q se consulta en
+    el mapa es_primo (un acceso por índice) en lugar de un set.
+    
     Returns:
         (cumple, representaciones) - tupla con resultado
     """
@@ -44,11 +69,9 @@ def verificar_goldbach_numero(n, set_primos):
     
     representaciones = []
     
-    for p in set_primos:
-        if p > n // 2:
-            break
+    for p in primos_mitad:
         q = n - p
-        if q in set_primos and q >= p:  # q >= p evita duplicados (3+7 = 7+3)
+        if es_primo[q] and q >= p:  # q >= p evita duplicados (3+7 = 7+3)
             representaciones.append((p, q))
     
     return len(representaciones) > 0, representaciones
@@ -67,7 +90,9 @@ def test_rapido():
     print("🔢 Generando primos...")
     inicio = time.time()
     primos = criba_eratostenes_simple(n_max)
-    set_primos = set(primos)
+    es_primo = bytearray(n_max + 1)
+    for p in primos:
+        es_primo[p] = 1
     tiempo_primos = time.time() - inicio
     print(f"   ✅ {len(primos)} primos generados en {tiempo_primos:.4f} segundos")
     
@@ -80,8 +105,15 @@ def test_rapido():
     contraejemplos = []
     casos_ejemplo = []
     
+    # Índice de corte en primos: como n crece, k_max solo avanza
+    k_max = 0
+    
     for n in range(6, n_max + 1, 2):  # Solo números PARES
-        cumple, representaciones = verificar_goldbach_numero(n, set_primos)
+        while k_max < len(primos) and primos[k_max] <= n // 2:
+            k_max += 1
+        cumple, representaciones = verificar_goldbach_numero(
+            n, islice(primos, k_max), es_primo
+        )
         
         total_verificados += 1
         
@@ -135,6 +167,287 @@ def test_rapido():
     print("="*70)
 
 
+# ═══════════════════════════════════════════════════════════════════════════
+# COMPARACIÓN CON verificador_goldbach.py
+# ═══════════════════════════════════════════════════════════════════════════
+
+@contextmanager
+def _config_temporal(**cambios):
+    """Cambia entradas de vg.CONFIG y las restaura al salir."""
+    anteriores = {clave: vg.CONFIG[clave] for clave in cambios}
+    vg.CONFIG.update(cambios)
+    try:
+        yield
+    finally:
+        vg.CONFIG.update(anteriores)
+
+
+def _archivos_en(directorio):
+    """Rutas de todos los archivos del verificador dentro de directorio."""
+    return {clave: os.path.join(directorio, os.path.basename(ruta))
+            for clave, ruta in vg.CONFIG.items() if clave.startswith("archivo_")}
+
+
+def _vaciar_criba():
+    """Deja la criba global del verificador como recién importada."""
+    vg._criba.update({clave: None for clave in vg._criba}, limite=-1)
+
+
+@contextmanager
+def _criba_de_prueba():
+    """Criba global vacía y segmentos pequeños; todo se restaura al salir."""
+    with _config_temporal(segment_bytes=SEGMENTO_PEQUEÑO):
+        _vaciar_criba()
+        try:
+            yield
+        finally:
+            _vaciar_criba()
+
+
+def _mapa_oraculo(limite):
+    """Mapa uint8 de los primos hasta limite según la criba simple."""
+    es_primo = np.zeros(limite + 1, dtype=np.uint8)
+    es_primo[criba_eratostenes_simple(limite)] = 1
+    return es_primo
+
+
+def _conteo_oraculo(limite):
+    """Representaciones p ≤ q de cada n ≤ limite, por fuerza bruta."""
+    primos = criba_eratostenes_simple(limite)
+    conteo = [0] * (limite + 1)
+    for i, p in enumerate(primos):
+        if 2 * p > limite:
+            break
+        for q in primos[i:]:
+            if p + q > limite:
+                break
+            conteo[p + q] += 1
+    return conteo
+
+
+def _nucleos_primer_par():
+    """Núcleos del modo rápido disponibles en esta máquina."""
+    nucleos = {"numpy": vg._tiene_representacion}
+    if vg.NUMBA_DISPONIBLE:
+        nucleos["numba"] = vg._tiene_representacion_numba
+    if vg.KERNEL_C_DISPONIBLE:
+        nucleos["c"] = lambda ns, primos, bits: vg._tiene_representacion_c(ns, bits)
+    return nucleos
+
+
+# Va antes que las pruebas con Numba: el Pool hace fork y, una vez arrancada
+# la capa de hilos TBB de Numba en este proceso, el proceso se cuelga al salir
+def test_verificacion_masiva_cubre_el_rango():
+    """Los batches cubren TODOS los pares del rango, sin saltarse ninguno."""
+    casos = ((20000, 1000, 2), (20000, 999, 2), (20000, 1000, 1), (200, 1, 2))
+    for n_final, tamaño_batch, num_cores in casos:
+        with tempfile.TemporaryDirectory() as directorio, _config_temporal(
+                n_final=n_final, tamaño_batch=tamaño_batch, num_cores=num_cores,
+                verbose=False, **_archivos_en(directorio)):
+            progreso = vg.verificacion_masiva_goldbach()
+        pares = len(range(6, n_final + 1, 2))
+        assert progreso["total_verificados"] == progreso["total_cumple"] == pares, tamaño_batch
+        assert progreso["ultimo_n_verificado"] == n_final
+
+
+def test_criba_segmentada():
+    """La criba segmentada da los mismos primos que la criba simple."""
+    limites = (0, 1, 2, 3, 4, 5, 63, 64, 65, 1000, 4096, 65537, 10**5)
+    # Alrededor de cuadrados de primos (la fase 1 usa la raíz entera)
+    limites += (48, 49, 50, 9408, 9409, 9410)
+    with _criba_de_prueba():
+        for limite in limites:
+            esperado = criba_eratostenes_simple(limite)
+            assert list(map(int, vg.criba_eratostenes_segmentada(limite))) == esperado, limite
+
+
+def test_mapas_de_bits():
+    """Empaquetar y desempaquetar el mapa de primos no pierde ningún bit."""
+    limite = 10**4 + 1
+    mapa = _mapa_oraculo(limite)
+    bits = vg.empaquetar_mapa(mapa)
+    assert (vg.desempaquetar_mapa(bits, limite) == mapa).all()
+    
+    # El mapa invertido tiene el bit k en la posición 64·len(bits) - 1 - k
+    completo = vg.desempaquetar_mapa(bits, 64 * len(bits) - 1)
+    invertido = vg.desempaquetar_mapa(vg.invertir_mapa(bits), 64 * len(bits) - 1)
+    assert (invertido == completo[::-1]).all()
+
+
+def test_criba_global():
+    """obtener_primos_hasta criba una vez y reutiliza la criba para límites menores."""
+    with _criba_de_prueba():
+        primos, bits, _ = vg.obtener_primos_hasta(10**5)
+        assert primos.tolist() == criba_eratostenes_simple(10**5)
+        assert (vg.desempaquetar_mapa(bits, 10**5) == _mapa_oraculo(10**5)).all()
+        
+        menores, bits_menores, _ = vg.obtener_primos_hasta(1000)
+        assert menores.tolist() == criba_eratostenes_simple(1000)
+        assert bits_menores is bits  # la misma criba, sin volver a cribar
+
+
+def test_criba_compartida():
+    """compartir_criba mueve la criba a memoria compartida sin cambiarla."""
+    with _criba_de_prueba():
+        vg.obtener_primos_hasta(10**4)
+        originales = {clave: np.array(array) for clave, array in vg._criba.items()
+                      if isinstance(array, np.ndarray)}
+        descriptor = vg.compartir_criba()
+        try:
+            for clave, original in originales.items():
+                assert (vg._criba[clave] == original).all(), clave
+            # Lo mismo que ve un worker al adjuntarse por nombre (spawn)
+            _vaciar_criba()
+            vg._adjuntar_criba(descriptor)
+            for clave, original in originales.items():
+                assert (vg._criba[clave] == original).all(), clave
+        finally:
+            vg.liberar_criba_compartida()
+
+
+def test_representaciones():
+    """Los núcleos de conteo dan lo mismo que la fuerza bruta."""
+    conteo = _conteo_oraculo(N_CONTEO)
+    mapa = _mapa_oraculo(N_CONTEO)
+    primos = np.array(criba_eratostenes_simple(N_CONTEO), dtype=np.int64)
+    bits = vg.empaquetar_mapa(mapa)
+    inversos = vg.invertir_mapa(bits)
+    
+    todos = np.arange(6, N_CONTEO + 1, 2, dtype=np.int64)
+    for ns in (todos, todos[::7], todos[-50:]):
+        esperado = [conteo[n] for n in ns.tolist()]
+        assert vg._representaciones_desplazadas(ns, primos, mapa).tolist() == esperado
+        assert vg._tabla_representaciones_fft(int(ns[-1]), mapa)[ns // 2].tolist() == esperado
+        assert vg._contar_representaciones(ns, primos, bits, inversos).tolist() == esperado
+        if vg.NUMBA_DISPONIBLE:
+            assert vg._representaciones_numba(ns, bits, inversos).tolist() == esperado
+
+
+def test_primer_par():
+    """Los núcleos del modo rápido encuentran un par para todo n par ≥ 4."""
+    primos = np.array(criba_eratostenes_simple(N_PRIMER_PAR), dtype=np.int64)
+    bits = vg.empaquetar_mapa(_mapa_oraculo(N_PRIMER_PAR))
+    rangos = ((4, 8), (6, N_PRIMER_PAR), (6, 6), (998, 1002), (N_PRIMER_PAR - 200, N_PRIMER_PAR))
+    for inicio, fin in rangos:
+        ns = np.arange(inicio, fin + 1, 2, dtype=np.int64)
+        for nombre, nucleo in _nucleos_primer_par().items():
+            assert nucleo(ns, primos, bits).all(), (nombre, inicio, fin)
+
+
+def test_primer_par_detecta_contraejemplos():
+    """Con un mapa al que le faltan primos, los núcleos ven los n sin par."""
+    limite = 20000
+    azar = random.Random(1)
+    # Se conservan los primos < 100: la tabla PRIMOS_PEQUEÑOS los da por primos
+    primos = [p for p in criba_eratostenes_simple(limite) if p < 100 or azar.random() < 0.05]
+    es_primo = np.zeros(limite + 1, dtype=np.uint8)
+    es_primo[primos] = 1
+    bits = vg.empaquetar_mapa(es_primo)
+    
+    ns = np.arange(6, limite + 1, 2, dtype=np.int64)
+    esperado = [any(es_primo[n - p] for p in primos if p <= n // 2) for n in ns.tolist()]
+    assert not all(esperado)  # el mapa recortado debe dejar contraejemplos
+    for nombre, nucleo in _nucleos_primer_par().items():
+        assert nucleo(ns, np.array(primos, dtype=np.int64), bits).tolist() == esperado, nombre
+
+
+def test_verificar_goldbach_rango():
+    """Un batch verifica todos sus pares y da el mínimo y el máximo correctos."""
+    conteo = _conteo_oraculo(N_CONTEO)
+    pares = range(6, N_CONTEO + 1, 2)
+    for contar_todas in (False, True):
+        with _config_temporal(contar_todas=contar_todas):
+            resultado = vg.verificar_goldbach_rango((6, N_CONTEO, False))
+        assert resultado["verificados"] == resultado["cumple"] == len(pares)
+        assert resultado["no_cumple"] == []
+        if contar_todas:
+            assert resultado["min_representaciones"] == min(conteo[n] for n in pares)
+            assert resultado["max_representaciones"] == max(conteo[n] for n in pares)
+    
+    # Modo rápido con muestra: min/max de unos pocos n del batch
+    with _config_temporal(contar_todas=False, muestreo_estadisticas=5):
+        resultado = vg.verificar_goldbach_rango((6, N_CONTEO, False))
+    assert (min(conteo[n] for n in pares) <= resultado["min_representaciones"]
+            <= resultado["max_representaciones"] <= max(conteo[n] for n in pares))
+    
+    muestra = np.arange(4, N_CONTEO + 1, 998, dtype=np.int64)
+    primos, bits, _ = vg.obtener_primos_hasta(N_CONTEO)
+    assert (vg._representaciones_muestra(muestra, primos, bits).tolist()
+            == [conteo[n] for n in muestra.tolist()])
+
+
+def test_checkpoint_ida_y_vuelta():
+    """guardar_progreso y cargar_progreso conservan todo el estado."""
+    with tempfile.TemporaryDirectory() as directorio, _config_temporal(
+            verbose=False, **_archivos_en(directorio)):
+        progreso = vg._progreso_inicial()
+        progreso.update(
+            ultimo_n_verificado=123456,
+            total_verificados=61725,
+            total_cumple=61722,
+            total_contraejemplos=3,
+            contraejemplos=[1000, 2000, 10**15],
+            min_representaciones=1,
+            max_representaciones=4321,
+            tiempo_total=12.5,
+        )
+        vg.guardar_progreso(progreso)
+        assert vg.cargar_progreso() == progreso
+        
+        # Escritura atómica: no queda el archivo temporal
+        assert not os.path.exists(vg.CONFIG["archivo_progreso"] + ".tmp")
+        
+        # El registro completo de contraejemplos solo crece por el final
+        vg.registrar_contraejemplos([10, 20])
+        vg.registrar_contraejemplos([30])
+        with open(vg.CONFIG["archivo_contraejemplos"], encoding='utf-8') as f:
+            assert f.read().split() == ["10", "20", "30"]
+
+
+def test_criba_fusionada():
+    """La criba fusionada verifica todos los pares, segmento a segmento y sin huecos."""
+    with _criba_de_prueba():
+        # Segmentos alineados a 64: se empaquetan en palabras completas
+        assert all(inicio % 64 == 0 for inicio, _ in vg._segmentos_criba(65537))
+        
+        for inicio in (6, 7, 5000):
+            resultados = list(vg.verificar_goldbach_fusionado(inicio, N_PRIMER_PAR))
+            esperados = len(range(inicio + inicio % 2, N_PRIMER_PAR + 1, 2))
+            assert sum(r["verificados"] for r in resultados) == esperados
+            assert sum(r["cumple"] for r in resultados) == esperados
+            assert resultados[0]["rango"][0] == inicio + inicio % 2
+            assert resultados[-1]["rango"][1] == N_PRIMER_PAR
+            for anterior, siguiente in zip(resultados, resultados[1:]):
+                assert siguiente["rango"][0] == anterior["rango"][1] + 2
+
+
+def test_representaciones_con_ventana():
+    """_representaciones_desplazadas sobre solo la ventana [n_inicio/2, n_fin] del mapa."""
+    conteo = _conteo_oraculo(N_CONTEO)
+    mapa = _mapa_oraculo(N_CONTEO)
+    primos = np.array(criba_eratostenes_simple(N_CONTEO), dtype=np.int64)
+    for inicio, paso in ((6, 2), (20002, 2), (10000, 14)):
+        ns = np.arange(inicio, N_CONTEO + 1, paso, dtype=np.int64)
+        desfase = int(ns[0]) // 2
+        representaciones = vg._representaciones_desplazadas(ns, primos, mapa[desfase:], desfase)
+        assert representaciones.tolist() == [conteo[n] for n in ns.tolist()]
+
+
 if __name__ == "__main__":
     exito = test_rapido()
+    
+    print("\n🔬 Comparando verificador_goldbach.py con la criba simple...")
+    for prueba in (test_verificacion_masiva_cubre_el_rango, test_criba_segmentada,
+                   test_mapas_de_bits, test_criba_global, test_criba_compartida,
+                   test_representaciones, test_primer_par,
+                   test_primer_par_detecta_contraejemplos,
+                   test_verificar_goldbach_rango, test_checkpoint_ida_y_vuelta,
+                   test_criba_fusionada, test_representaciones_con_ventana):
+        try:
+            prueba()
+            print(f"   ✅ {prueba.__name__}")
+        except AssertionError as e:
+            print(f"   ❌ {prueba.__name__}: {e}")
+            exito = False
+    
     exit(0 if exito else 1)
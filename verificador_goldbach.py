@@ -29,16 +29,85 @@ Uso:
 
 import os
 import json
+import ctypes
 import time
 import math
+import struct
 from datetime import datetime, timedelta
-from multiprocessing import Pool, cpu_count
+from multiprocessing import Pool, cpu_count, shared_memory
 import sys
 
+import numpy as np
+
+# Numba es opcional: si está instalado, el núcleo de conteo se compila a código nativo
+try:
+    import numba
+    from numba import njit, prange
+    NUMBA_DISPONIBLE = True
+except ImportError:
+    NUMBA_DISPONIBLE = False
+
+# Núcleo en C opcional (goldbach_kernel.c): se usa si ya está compilado
+# junto a este archivo con compilar_kernel.sh
+try:
+    _kernel_c = ctypes.CDLL(os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "goldbach_kernel.so"
+    ))
+    _kernel_c.goldbach_contraejemplos.restype = ctypes.c_int64
+    _kernel_c.goldbach_contraejemplos.argtypes = [
+        np.ctypeslib.ndpointer(dtype=np.uint64, flags='C_CONTIGUOUS'),
+        ctypes.c_int64, ctypes.c_int64,
+        np.ctypeslib.ndpointer(dtype=np.int64, flags='C_CONTIGUOUS'),
+        ctypes.c_int64,
+    ]
+    KERNEL_C_DISPONIBLE = True
+except (OSError, AttributeError):
+    KERNEL_C_DISPONIBLE = False
+
 # ═══════════════════════════════════════════════════════════════════════════
 # CONFIGURACIÓN - ¡AJUSTA ESTOS VALORES SEGÚN TU PC Y OBJETIVOS!
 # ═══════════════════════════════════════════════════════════════════════════
 
+def _tamaño_cache_l2(por_defecto):
+    """
+    Tamaño en bytes de la caché L2 del procesador.
+    
+    Usa os.sysconf si Python conoce el nombre y, si no, la información que
+    Linux publica en /sys.
+    
+    Args:
+        por_defecto: Valor si el sistema no lo informa (Windows, macOS...)
+        
+    Returns:
+        Tamaño en bytes
+    """
+    try:
+        tamaño = os.sysconf("SC_LEVEL2_CACHE_SIZE")
+        if tamaño > 0:
+            return tamaño
+    except (AttributeError, ValueError, OSError):
+        pass
+    
+    directorio = "/sys/devices/system/cpu/cpu0/cache"
+    try:
+        for indice in sorted(os.listdir(directorio)):
+            if not indice.startswith("index"):
+                continue
+            ruta = os.path.join(directorio, indice)
+            with open(os.path.join(ruta, "level")) as f:
+                if f.read().strip() != "2":
+                    continue
+            with open(os.path.join(ruta, "size")) as f:
+                tamaño = f.read().strip()  # p. ej. "2048K"
+            unidades = {"K": 1024, "M": 1024**2}
+            if tamaño[-1] in unidades:
+                return int(tamaño[:-1]) * unidades[tamaño[-1]]
+            return int(tamaño)
+    except (OSError, ValueError, IndexError):
+        pass
+    return por_defecto
+
+
 CONFIG = {
     # Rango de verificación
     "n_inicial": 6,                    # Primer número par a verificar
@@ -47,95 +116,632 @@ CONFIG = {
     
     # Paralelización
     "num_cores": max(1, cpu_count() - 1),  # Usar todos los cores menos 1
+    "batches_por_core": 8,             # Batches en vuelo por core en cada ronda
+    "chunksize": 4,                    # Batches que recibe un worker de una vez
     
     # Gestión de archivos
-    "archivo_progreso": "progreso_goldbach.json",
+    "archivo_progreso": "progreso_goldbach.bin",
+    "archivo_progreso_legado": "progreso_goldbach.json",  # Formato JSON anterior (solo lectura)
+    "max_contraejemplos": 1000,        # Contraejemplos guardados en el checkpoint
+    "archivo_contraejemplos": "contraejemplos_goldbach.log",  # TODOS los contraejemplos (solo se añade)
     "archivo_log": "log_goldbach.txt",
     
-    # Rendimiento
-    "tamaño_batch": 10000,             # Números por lote
+    # Rendimiento (tamaños pensados para que el trabajo quepa en la caché L2)
+    "segment_bytes": _tamaño_cache_l2(256 * 1024),       # Segmento de criba (1 byte/número)
+    "batch_bytes": _tamaño_cache_l2(256 * 1024) // 2,    # Datos de trabajo de un batch
+    "tamaño_batch": None,              # Números por lote (None = automático según batch_bytes)
+    "limite_fft": 10**7,               # Hasta aquí se cuenta con FFT; más allá, con desplazamientos
+    "contar_todas": False,             # True: contar TODAS las representaciones de cada n (lento)
+    "muestreo_estadisticas": 0,        # Modo rápido: n por batch con min/max de representaciones (0 = ninguno)
     "intervalo_guardado": 3600,        # Guardar cada hora (segundos)
     
     # Salida
     "verbose": True                    # Mostrar mensajes detallados
 }
 
+if CONFIG["tamaño_batch"] is None:
+    # El array de n del batch (int64 por cada par: 4 bytes por número) domina
+    # los datos de trabajo; los mapas de bits ocupan 1/8 de byte por número
+    CONFIG["tamaño_batch"] = max(10000, CONFIG["batch_bytes"] // 4)
+
 # ═══════════════════════════════════════════════════════════════════════════
 # FUNCIONES MATEMÁTICAS OPTIMIZADAS
 # ═══════════════════════════════════════════════════════════════════════════
 
-def criba_eratostenes_segmentada(limite):
+# Rueda 2·3·5·7: patrón periódico (período 210) de los números coprimos con
+# 210. Solo 48 de cada 210 residuos pueden ser primos (mayores que 7).
+PRIMOS_RUEDA = (2, 3, 5, 7)
+PERIODO_RUEDA = 210
+_patron_rueda = np.ones(PERIODO_RUEDA, dtype=np.bool_)
+for _p in PRIMOS_RUEDA:
+    _patron_rueda[::_p] = False
+del _p
+
+
+def _segmentos_criba(limite):
     """
-    Criba de Eratóstenes optimizada usando segmentación de memoria.
+    Genera la criba de Eratóstenes hasta limite, segmento a segmento.
     
-    Esta implementación es eficiente incluso para límites muy grandes
-    (millones o billones) ya que divide el problema en segmentos.
+    Cada segmento se entrega en cuanto está cribado, así quien lo consume
+    puede usarlo mientras sigue en caché. Todos los segmentos (salvo el
+    último) empiezan y terminan en múltiplos de 64, de modo que se pueden
+    empaquetar directamente en palabras de un mapa de bits.
     
     Args:
-        limite: Encontrar todos los primos hasta este número
+        limite: Cribar los números 0..limite
         
-    Returns:
-        Lista de todos los números primos ≤ limite
+    Yields:
+        Tuplas (inicio, segmento), con segmento[i] verdadero si inicio + i es primo
     """
     if limite < 2:
-        return []
+        return
     
-    # Fase 1: Generar primos pequeños (hasta √limite)
-    sqrt_limite = int(math.sqrt(limite)) + 1
-    es_primo_pequeño = [True] * sqrt_limite
-    es_primo_pequeño[0] = es_primo_pequeño[1] = False
+    # Fase 1: Generar primos pequeños (hasta √limite, redondeado a 64)
+    # Raíz entera exacta (math.isqrt): sin redondeo de coma flotante
+    sqrt_limite = -(-(math.isqrt(limite) + 1) // 64) * 64
+    tamaño_fase_1 = min(sqrt_limite, limite + 1)
+    es_primo_pequeño = np.ones(tamaño_fase_1, dtype=np.bool_)
+    es_primo_pequeño[:2] = False
     
-    for i in range(2, int(math.sqrt(sqrt_limite)) + 1):
+    limite_fase_1 = math.isqrt(tamaño_fase_1 - 1) + 1
+    for i in range(2, limite_fase_1):
         if es_primo_pequeño[i]:
-            for j in range(i*i, sqrt_limite, i):
-                es_primo_pequeño[j] = False
+            # Tachado de múltiplos en una sola escritura con paso (bucle en C)
+            es_primo_pequeño[i*i::i] = False
     
-    primos_pequeños = [i for i in range(sqrt_limite) if es_primo_pequeño[i]]
+    yield 0, es_primo_pequeño
     
-    if limite <= sqrt_limite:
-        return [p for p in primos_pequeños if p <= limite]
+    if limite < sqrt_limite:
+        return
     
     # Fase 2: Usar primos pequeños para cribar segmentos grandes
-    tamaño_segmento = min(sqrt_limite, 10**6)
-    primos = primos_pequeños.copy()
+    primos_pequeños = np.flatnonzero(es_primo_pequeño)
+    tamaño_segmento = max(64, CONFIG["segment_bytes"] // 64 * 64)
+    
+    # Pre-criba con la rueda: cada segmento arranca como una copia del patrón
+    # (ya sin múltiplos de 2, 3, 5 y 7), así que esos primos no se tachan.
+    # El patrón también borra 2, 3, 5 y 7, pero la fase 2 empieza en
+    # sqrt_limite ≥ 64: los primos de la rueda caen siempre en la fase 1
+    patron = np.tile(_patron_rueda, tamaño_segmento // PERIODO_RUEDA + 2)
+    primos_a_tachar = primos_pequeños[primos_pequeños > PRIMOS_RUEDA[-1]]
+    
+    # Próximo múltiplo a tachar de cada primo base, arrastrado de un segmento
+    # al siguiente: arranca en max(p², primer múltiplo ≥ sqrt_limite)
+    siguiente_multiplo = np.maximum(
+        primos_a_tachar * primos_a_tachar,
+        -(-sqrt_limite // primos_a_tachar) * primos_a_tachar
+    )
+    lista_primos_a_tachar = primos_a_tachar.tolist()
     
     for inicio in range(sqrt_limite, limite + 1, tamaño_segmento):
         fin = min(inicio + tamaño_segmento, limite + 1)
-        segmento = [True] * (fin - inicio)
-        
-        for p in primos_pequeños:
-            primer_multiplo = ((inicio + p - 1) // p) * p
-            if primer_multiplo < inicio:
-                primer_multiplo += p
-            if primer_multiplo == p:
-                primer_multiplo += p
-            
-            for j in range(primer_multiplo, fin, p):
-                segmento[j - inicio] = False
+        desfase = inicio % PERIODO_RUEDA
+        segmento = patron[desfase:desfase + fin - inicio].copy()
+        
+        for p, multiplo in zip(lista_primos_a_tachar, siguiente_multiplo.tolist()):
+            segmento[multiplo - inicio::p] = False
+        
+        # Avanzar todos los punteros al primer múltiplo ≥ fin (vectorizado)
+        saltos = np.maximum(0, -(-(fin - siguiente_multiplo) // primos_a_tachar))
+        siguiente_multiplo += saltos * primos_a_tachar
+        
+        yield inicio, segmento
+
+
+def criba_eratostenes_segmentada(limite):
+    """
+    Criba de Eratóstenes optimizada usando segmentación de memoria.
+    
+    Esta implementación es eficiente incluso para límites muy grandes
+    (millones o billones) ya que divide el problema en segmentos.
+    
+    Args:
+        limite: Encontrar todos los primos hasta este número
+        
+    Returns:
+        Array de numpy con todos los números primos ≤ limite
+    """
+    primos = [np.flatnonzero(segmento) + inicio
+              for inicio, segmento in _segmentos_criba(limite)]
+    if not primos:
+        return np.array([], dtype=np.int64)
+    return np.concatenate(primos)
+
+
+def empaquetar_mapa(es_primo):
+    """
+    Empaqueta un mapa de primos (un byte por número) en palabras de 64 bits.
+    
+    El bit k está en la palabra k >> 6, posición k & 63, así que comprobar
+    si k es primo es una carga y un desplazamiento. Ocupa 8 veces menos
+    memoria que el mapa de bytes: caben 8 veces más números en L1/L2.
+    
+    Args:
+        es_primo: Array booleano (o uint8) con es_primo[k] verdadero si k es primo
+        
+    Returns:
+        Array de numpy uint64 con un bit por número
+    """
+    bytes_empaquetados = np.packbits(es_primo.astype(np.bool_), bitorder='little')
+    relleno = -len(bytes_empaquetados) % 8
+    return np.concatenate([
+        bytes_empaquetados, np.zeros(relleno, dtype=np.uint8)
+    ]).view(np.uint64)
+
+
+def desempaquetar_mapa(bits, n):
+    """
+    Inversa de empaquetar_mapa: mapa uint8 de los números 0..n.
+    
+    Args:
+        bits: Mapa empaquetado (uint64)
+        n: Último número a desempaquetar
         
-        primos.extend([inicio + i for i in range(len(segmento)) if segmento[i]])
+    Returns:
+        Array de numpy uint8 de longitud n + 1
+    """
+    return np.unpackbits(bits.view(np.uint8), count=n + 1, bitorder='little')
+
+
+# Cada byte con el orden de sus 8 bits invertido
+_BYTE_INVERTIDO = np.array([int(f"{b:08b}"[::-1], 2) for b in range(256)], dtype=np.uint8)
+
+
+def invertir_mapa(bits):
+    """
+    Invierte el orden de los bits de un mapa empaquetado.
+    
+    El bit k del resultado es el bit (64·len(bits) - 1 - k) del original.
+    Se invierte el orden de los bytes y los bits de cada byte con una
+    tabla, sin desempaquetar el mapa (un byte por número).
     
-    return primos
+    Args:
+        bits: Mapa empaquetado (uint64)
+        
+    Returns:
+        Array de numpy uint64 del mismo tamaño
+    """
+    return _BYTE_INVERTIDO[bits.view(np.uint8)[::-1]].view(np.uint64)
+
 
+# Criba global: UNA sola, hasta el mayor límite pedido (compartida entre
+# procesos mediante fork o cargada por _inicializar_worker)
+_criba = {
+    "limite": -1,
+    "primos": None,
+    "bits_primos": None,
+    "bits_inversos": None,
+    "representaciones": None,  # Tabla FFT (solo con contar_todas)
+}
 
-# Cache global de primos (compartido entre procesos mediante fork)
-_cache_primos = {}
-_cache_set_primos = {}
+# Bloques de memoria compartida en uso (referencias para que no se liberen)
+_memoria_compartida = []
 
 def obtener_primos_hasta(n):
     """
-    Obtiene lista de primos hasta n, usando cache para evitar recálculos.
+    Obtiene los primos hasta n, reutilizando la criba global si ya cubre n.
+    
+    Solo se vuelve a cribar si se pide un límite mayor que el cribado;
+    cualquier n menor reutiliza la misma criba (no hay una por batch).
     
     Args:
         n: Límite superior
         
     Returns:
-        Tupla (lista_primos, set_primos)
+        Tupla (primos, bits_primos, bits_inversos), donde primos es un array
+        de numpy, bits_primos el mapa de primos empaquetado en palabras uint64
+        (un bit por número) y bits_inversos el mismo mapa con los bits
+        invertidos (None sin Numba: solo lo usa _representaciones_numba).
+        Los mapas cubren al menos 0..n (pueden ser más largos).
+    """
+    if n > _criba["limite"]:
+        # Cada segmento se empaqueta en cuanto sale de la criba: nunca se
+        # construye el mapa completo de un byte por número
+        bits_primos = np.zeros(n // 64 + 1, dtype=np.uint64)
+        trozos = []
+        for inicio, segmento in _segmentos_criba(n):
+            palabras = empaquetar_mapa(segmento)
+            bits_primos[inicio >> 6:(inicio >> 6) + len(palabras)] = palabras
+            trozos.append(np.flatnonzero(segmento) + inicio)
+        primos = np.concatenate(trozos) if trozos else np.array([], dtype=np.int64)
+        del trozos
+        _criba.update(
+            limite=n,
+            primos=primos,
+            bits_primos=bits_primos,
+            bits_inversos=invertir_mapa(bits_primos) if NUMBA_DISPONIBLE else None,
+        )
+    
+    primos = _criba["primos"]
+    if n < _criba["limite"]:
+        primos = primos[:np.searchsorted(primos, n, side='right')]
+    return primos, _criba["bits_primos"], _criba["bits_inversos"]
+
+
+def compartir_criba():
+    """
+    Mueve los arrays de la criba global a memoria compartida.
+    
+    Todos los workers mapean la MISMA copia física de los primos y los
+    mapas de bits, también con spawn (donde no hay copy-on-write), en lugar
+    de tener una copia por proceso.
+    
+    Returns:
+        Descriptor (picklable) para adjuntar la criba desde otro proceso
+    """
+    descriptor = {"limite": _criba["limite"], "arrays": {}}
+    for clave in ("primos", "bits_primos", "bits_inversos", "representaciones"):
+        array = _criba[clave]
+        if array is None:
+            continue
+        shm = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+        compartido = np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)
+        compartido[...] = array
+        _criba[clave] = compartido
+        _memoria_compartida.append(shm)
+        descriptor["arrays"][clave] = (shm.name, array.dtype.str, array.shape)
+    return descriptor
+
+
+def _adjuntar_criba(descriptor):
+    """
+    Instala como criba global la criba compartida por compartir_criba.
+    
+    Args:
+        descriptor: Valor devuelto por compartir_criba en el proceso padre
+    """
+    arrays = {}
+    for clave, (nombre, dtype, forma) in descriptor["arrays"].items():
+        shm = shared_memory.SharedMemory(name=nombre)
+        _memoria_compartida.append(shm)
+        arrays[clave] = np.ndarray(forma, dtype=dtype, buffer=shm.buf)
+    _criba.update(limite=descriptor["limite"], **arrays)
+
+
+def liberar_criba_compartida():
+    """
+    Elimina los bloques de memoria compartida creados por compartir_criba.
+    
+    La criba global vuelve antes a memoria privada: al cerrar un bloque se
+    desmapea, y los arrays que lo usaban dejarían de ser válidos.
+    """
+    if not _memoria_compartida:
+        return
+    for clave, array in _criba.items():
+        if isinstance(array, np.ndarray):
+            _criba[clave] = array.copy()
+    for shm in _memoria_compartida:
+        shm.close()
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+    _memoria_compartida.clear()
+
+
+def _tabla_representaciones_fft(n_max, es_primo):
+    """
+    Cuenta representaciones con una autoconvolución FFT del mapa de primos.
+    
+    El coeficiente k de (Σ x^p)² es el número de pares ORDENADOS (p, q)
+    con p + q = k, así que una sola FFT resuelve todos los n a la vez.
+    
+    Args:
+        n_max: Último n de la tabla
+        es_primo: Mapa de primos (uint8) hasta al menos n_max
+        
+    Returns:
+        Array int32 con tabla[k] = número de representaciones p ≤ q de n = 2k,
+        para todo 2k ≤ n_max
+    """
+    mapa = es_primo[:n_max + 1].astype(np.float64)
+    
+    # Longitud ≥ 2·n_max + 1 para que la convolución circular no se pliegue
+    longitud = 1 << (2 * n_max).bit_length()
+    espectro = np.fft.rfft(mapa, longitud)
+    del mapa
+    ordenados = np.rint(np.fft.irfft(espectro * espectro, longitud)[:n_max + 1:2])
+    del espectro
+    
+    # Cada p < q aparece dos veces (p+q y q+p); p = q = n/2 solo una
+    return ((ordenados + es_primo[:len(ordenados)]) // 2).astype(np.int32)
+
+
+def obtener_tabla_representaciones(n):
+    """
+    Tabla FFT de representaciones de todos los pares hasta n.
+    
+    Se calcula UNA vez (el proceso padre la prepara antes de crear el Pool
+    y la comparte con la criba); cada batch solo indexa su trozo, en lugar
+    de repetir la convolución completa de [0, n].
+    
+    Args:
+        n: Último n que debe cubrir la tabla
+        
+    Returns:
+        Array int32 con tabla[k] = representaciones de n = 2k
+    """
+    tabla = _criba["representaciones"]
+    if tabla is None or 2 * (len(tabla) - 1) < n - 1:
+        _, bits_primos, _ = obtener_primos_hasta(n)
+        tabla = _tabla_representaciones_fft(n, desempaquetar_mapa(bits_primos, n))
+        _criba["representaciones"] = tabla
+    return tabla
+
+
+def _representaciones_desplazadas(ns, primos, es_primo, desfase=0):
+    """
+    Cuenta representaciones sumando copias desplazadas del mapa de primos.
+    
+    Para cada primo p se suma de una vez es_primo[n - p] sobre todos los n
+    del rango (una operación vectorizada por primo, sin bucle por n).
+    Se usa cuando el rango es demasiado grande para la FFT.
+    
+    Args:
+        ns: Array de números pares en progresión aritmética (consecutivos o
+            una muestra con paso fijo)
+        primos: Array ordenado de primos hasta al menos max(ns)/2
+        es_primo: Mapa de primos (uint8) desde desfase hasta al menos max(ns)
+        desfase: Número al que corresponde es_primo[0] (como mucho min(ns)/2,
+            el menor n - p que se consulta)
+        
+    Returns:
+        Array con el número de representaciones p ≤ q de cada n
+    """
+    n_inicio, n_fin = int(ns[0]), int(ns[-1])
+    paso = int(ns[1] - ns[0]) if len(ns) > 1 else 2
+    representaciones = np.zeros(len(ns), dtype=np.int64)
+    
+    # Primos ≤ n_fin/2, recortados una vez por batch (sin comparar en el bucle)
+    primos_mitad = primos[:np.searchsorted(primos, n_fin // 2, side='right')]
+    
+    for p in primos_mitad.tolist():
+        # Solo cuentan los n con p ≤ n/2 (simetría)
+        k = max(0, -(-(2 * p - n_inicio) // paso))
+        representaciones[k:] += es_primo[n_inicio + paso * k - p - desfase:n_fin - p + 1 - desfase:paso]
+    
+    return representaciones
+
+
+# Constantes para contar bits con SWAR (popcount en registros de 64 bits)
+_M1 = np.uint64(0x5555555555555555)
+_M2 = np.uint64(0x3333333333333333)
+_M4 = np.uint64(0x0F0F0F0F0F0F0F0F)
+_H01 = np.uint64(0x0101010101010101)
+_UNOS = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+if NUMBA_DISPONIBLE:
+    @njit(cache=True, inline='always')
+    def _popcount64(x):
+        """Cuenta los bits a 1 de una palabra uint64 (SWAR)."""
+        x = x - ((x >> np.uint64(1)) & _M1)
+        x = (x & _M2) + ((x >> np.uint64(2)) & _M2)
+        x = (x + (x >> np.uint64(4))) & _M4
+        return (x * _H01) >> np.uint64(56)
+    
+    @njit(cache=True, parallel=True)
+    def _representaciones_numba(ns, bits_primos, bits_inversos):
+        """
+        Núcleo compilado con Numba: cuenta representaciones con AND + popcount.
+        
+        r(n) = Σ_{i ≤ n/2} B[i]·B[n-i], y B[n-i] es el bit (ultimo_bit - n + i)
+        del mapa invertido. Así cada palabra de 64 bits de B se compara con
+        una ventana alineada del mapa invertido: 64 candidatos p por AND
+        en lugar de un test de primalidad por primo.
+        
+        Args:
+            ns: Array de números pares a evaluar
+            bits_primos: Mapa de primos empaquetado (uint64), ver empaquetar_mapa
+            bits_inversos: El mismo mapa con el orden de los bits invertido
+            
+        Returns:
+            Array con el número de representaciones p ≤ q de cada n
+        """
+        ultimo_bit = 64 * len(bits_inversos) - 1
+        representaciones = np.zeros(len(ns), dtype=np.int64)
+        for i in prange(len(ns)):
+            n = ns[i]
+            mitad = n // 2
+            desfase = ultimo_bit - n
+            palabra_inicial = desfase >> 6
+            corrimiento = np.uint64(desfase & 63)
+            ultima_palabra = mitad >> 6
+            cuenta = 0
+            for j in range(ultima_palabra + 1):
+                # Ventana de 64 bits del mapa invertido: B[n-64j-63 .. n-64j]
+                k = palabra_inicial + j
+                ventana = bits_inversos[k] >> corrimiento
+                if corrimiento != 0 and k + 1 < len(bits_inversos):
+                    ventana |= bits_inversos[k + 1] << (np.uint64(64) - corrimiento)
+                
+                palabra = bits_primos[j] & ventana
+                if j == ultima_palabra:
+                    # Solo p ≤ n/2 (simetría)
+                    palabra &= _UNOS >> np.uint64(63 - (mitad & 63))
+                cuenta += _popcount64(palabra)
+            representaciones[i] = cuenta
+        return representaciones
+    
+    @njit(cache=True, parallel=True)
+    def _tiene_representacion_numba(ns, primos, bits_primos):
+        """
+        Núcleo compilado del modo rápido: ¿tiene n AL MENOS una representación?
+        
+        Recorre los primos de menor a mayor y corta en el primer p con n - p
+        primo, en lugar de contarlos todos.
+        
+        Args:
+            ns: Array de números pares a evaluar
+            primos: Array ordenado de primos hasta al menos max(ns)/2
+            bits_primos: Mapa de primos empaquetado (uint64)
+            
+        Returns:
+            Array booleano: True si n cumple Goldbach
+        """
+        cumple = np.zeros(len(ns), dtype=np.bool_)
+        for i in prange(len(ns)):
+            n = ns[i]
+            for p in primos:
+                if p > n // 2:
+                    break
+                q = n - p
+                if (bits_primos[q >> 6] >> np.uint64(q & 63)) & np.uint64(1):
+                    cumple[i] = True
+                    break
+        return cumple
+
+
+# Primos impares < 100: casi todo n par tiene un par p + q con p en esta
+# tabla, así que se prueban primero para todo el batch a la vez
+PRIMOS_PEQUEÑOS = (3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43,
+                   47, 53, 59, 61, 67, 71, 73, 79, 83, 89, 97)
+
+# Primos por consulta en la búsqueda completa de un n: pocas operaciones
+# vectorizadas por n y se corta pronto al encontrar el par
+BLOQUE_BUSQUEDA = 4096
+
+
+def _es_primo_vectorizado(qs, bits_primos):
+    """
+    Test de primalidad de un array de números sobre el mapa empaquetado.
+    
+    Args:
+        qs: Array de números (int64)
+        bits_primos: Mapa de primos empaquetado (uint64)
+        
+    Returns:
+        Array booleano: True si q es primo
     """
-    if n not in _cache_primos:
-        _cache_primos[n] = criba_eratostenes_segmentada(n)
-        _cache_set_primos[n] = set(_cache_primos[n])
-    return _cache_primos[n], _cache_set_primos[n]
+    desplazamiento = (qs & 63).astype(np.uint64)
+    return ((bits_primos[qs >> 6] >> desplazamiento) & np.uint64(1)).astype(np.bool_)
+
+
+def _tiene_representacion(ns, primos, bits_primos):
+    """
+    Modo rápido sin Numba: corta la búsqueda de cada n en el primer par.
+    
+    Primero se prueban los PRIMOS_PEQUEÑOS para todo el batch con
+    operaciones vectorizadas; solo los (rarísimos) n que quedan sin par
+    pasan a la búsqueda completa, uno por uno.
+    
+    Args:
+        ns: Array de números pares (≥ 4) a evaluar
+        primos: Array ordenado de primos hasta al menos max(ns)/2
+        bits_primos: Mapa de primos empaquetado (uint64)
+        
+    Returns:
+        Array booleano: True si n cumple Goldbach
+    """
+    cumple = np.zeros(len(ns), dtype=np.bool_)
+    for p in PRIMOS_PEQUEÑOS:
+        pendientes = np.flatnonzero(~cumple & (ns >= 2 * p))
+        if len(pendientes) == 0:
+            break
+        cumple[pendientes] = _es_primo_vectorizado(ns[pendientes] - p, bits_primos)
+    
+    # Búsqueda completa con todos los primos ≤ n/2 desde p = 2 (el par de
+    # n = 4, que la tabla no tiene), por bloques
+    for i in np.flatnonzero(~cumple).tolist():
+        n = int(ns[i])
+        fin = int(np.searchsorted(primos, n >> 1, side='right'))
+        for desde in range(0, fin, BLOQUE_BUSQUEDA):
+            bloque = primos[desde:min(desde + BLOQUE_BUSQUEDA, fin)]
+            if _es_primo_vectorizado(n - bloque, bits_primos).any():
+                cumple[i] = True
+                break
+    return cumple
+
+
+def _tiene_representacion_c(ns, bits_primos):
+    """
+    Modo rápido con el núcleo en C (goldbach_kernel.c).
+    
+    El núcleo hace OR del mapa desplazado por cada primo sobre toda la
+    ventana, 64 números por palabra, y solo devuelve los contraejemplos.
+    
+    Args:
+        ns: Array de números pares consecutivos (paso 2)
+        bits_primos: Mapa de primos empaquetado (uint64) hasta al menos max(ns)
+        
+    Returns:
+        Array booleano: True si n cumple Goldbach
+    """
+    contraejemplos = np.empty(len(ns), dtype=np.int64)
+    total = _kernel_c.goldbach_contraejemplos(
+        bits_primos, int(ns[0]), int(ns[-1]), contraejemplos, len(contraejemplos)
+    )
+    if total < 0:
+        raise MemoryError("goldbach_kernel: sin memoria para la ventana")
+    cumple = np.ones(len(ns), dtype=np.bool_)
+    cumple[(contraejemplos[:total] - ns[0]) // 2] = False
+    return cumple
+
+
+def _cumple_goldbach(ns, primos, bits_primos):
+    """
+    Modo rápido con el mejor núcleo disponible: C, Numba o NumPy.
+    
+    Args:
+        ns: Array de números pares consecutivos (paso 2)
+        primos: Array ordenado de primos hasta al menos max(ns)/2
+        bits_primos: Mapa de primos empaquetado (uint64)
+        
+    Returns:
+        Array booleano: True si n cumple Goldbach
+    """
+    if KERNEL_C_DISPONIBLE:
+        return _tiene_representacion_c(ns, bits_primos)
+    if NUMBA_DISPONIBLE:
+        return _tiene_representacion_numba(ns, primos, bits_primos)
+    return _tiene_representacion(ns, primos, bits_primos)
+
+
+def _contar_representaciones(ns, primos, bits_primos, bits_inversos):
+    """
+    Cuenta las representaciones de cada n con el mejor núcleo disponible.
+    
+    Args:
+        ns: Array de números pares (en progresión aritmética)
+        primos: Array ordenado de primos hasta al menos max(ns)
+        bits_primos: Mapa de primos empaquetado (uint64)
+        bits_inversos: El mismo mapa con los bits invertidos
+        
+    Returns:
+        Array con el número de representaciones p ≤ q de cada n
+    """
+    n_fin = int(ns[-1])
+    if n_fin <= CONFIG["limite_fft"]:
+        return obtener_tabla_representaciones(n_fin)[ns // 2].astype(np.int64)
+    if NUMBA_DISPONIBLE:
+        return _representaciones_numba(ns, bits_primos, bits_inversos)
+    # Solo se consulta n - p ≥ n/2: basta desempaquetar desde la palabra de
+    # n_inicio/2, no el mapa entero desde 0
+    palabra = (int(ns[0]) // 2) >> 6
+    ventana = desempaquetar_mapa(bits_primos[palabra:], n_fin - 64 * palabra)
+    return _representaciones_desplazadas(ns, primos, ventana, 64 * palabra)
+
+
+def _representaciones_muestra(ns, primos, bits_primos):
+    """
+    Cuenta las representaciones de unos pocos n, cada uno por separado.
+    
+    Cada n es una sola consulta vectorizada al mapa empaquetado con sus
+    primos p ≤ n/2: no se recorre el resto del batch ni se desempaqueta
+    el mapa.
+    
+    Args:
+        ns: Array de números pares (pocos)
+        primos: Array ordenado de primos hasta al menos max(ns)/2
+        bits_primos: Mapa de primos empaquetado (uint64)
+        
+    Returns:
+        Array con el número de representaciones p ≤ q de cada n
+    """
+    fines = np.searchsorted(primos, ns // 2, side='right')
+    return np.array([
+        np.count_nonzero(_es_primo_vectorizado(n - primos[:fin], bits_primos))
+        for n, fin in zip(ns.tolist(), fines.tolist())
+    ], dtype=np.int64)
 
 
 def verificar_goldbach_rango(args):
@@ -144,6 +750,11 @@ def verificar_goldbach_rango(args):
     
     Esta función es ejecutada en paralelo por múltiples procesos.
     
+    Con CONFIG["contar_todas"] = False (modo rápido, el habitual) basta con
+    encontrar UN par por n para descartar el contraejemplo; el mínimo y el
+    máximo de representaciones solo se calculan si CONFIG["muestreo_estadisticas"]
+    lo pide, sobre esa cantidad de n repartidos por el batch.
+    
     Args:
         args: Tupla (n_inicio, n_fin, verbose)
         
@@ -156,9 +767,10 @@ def verificar_goldbach_rango(args):
     if n_inicio % 2 != 0:
         n_inicio += 1
     
-    # Obtener primos necesarios
+    # Obtener primos necesarios (reutiliza la criba hasta n_final que el
+    # proceso padre construyó antes de crear el Pool)
     max_primo_necesario = n_fin
-    primos, set_primos = obtener_primos_hasta(max_primo_necesario)
+    primos, bits_primos, bits_inversos = obtener_primos_hasta(max_primo_necesario)
     
     resultados = {
         "rango": (n_inicio, n_fin),
@@ -172,88 +784,299 @@ def verificar_goldbach_rango(args):
     
     inicio_tiempo = time.time()
     
-    # Verificar cada número par en el rango
-    for n in range(n_inicio, n_fin + 1, 2):
-        representaciones = 0
-        
-        # Buscar pares de primos que suman n
-        # Optimización: solo verificar hasta n/2 por simetría
-        for p in primos:
-            if p > n // 2:
-                break
-            q = n - p
-            if q in set_primos:
-                representaciones += 1
-        
-        resultados["verificados"] += 1
-        
-        if representaciones > 0:
-            resultados["cumple"] += 1
-            resultados["min_representaciones"] = min(
-                resultados["min_representaciones"], 
-                representaciones
-            )
-            resultados["max_representaciones"] = max(
-                resultados["max_representaciones"], 
-                representaciones
-            )
+    ns = np.arange(n_inicio, n_fin + 1, 2, dtype=np.int64)
+    if len(ns) == 0:
+        return resultados
+    
+    if CONFIG["contar_todas"]:
+        # Contar representaciones de todos los n del rango a la vez
+        representaciones = _contar_representaciones(ns, primos, bits_primos, bits_inversos)
+        cumple = representaciones > 0
+    else:
+        # Modo rápido: basta el primer par de cada n
+        cumple = _cumple_goldbach(ns, primos, bits_primos)
+        muestras = CONFIG["muestreo_estadisticas"]
+        if muestras > 0:
+            # Contar un n son ~n/(2 ln n) consultas al mapa: solo unos pocos por batch
+            muestra = ns[::max(1, len(ns) // muestras)][:muestras]
+            representaciones = _representaciones_muestra(muestra, primos, bits_primos)
         else:
-            # ¡Contraejemplo encontrado!
-            resultados["no_cumple"].append(n)
+            representaciones = np.zeros(0, dtype=np.int64)
+    
+    resultados["verificados"] = len(ns)
+    resultados["cumple"] = int(np.count_nonzero(cumple))
+    
+    if np.any(representaciones > 0):
+        resultados["min_representaciones"] = int(representaciones[representaciones > 0].min())
+        resultados["max_representaciones"] = int(representaciones.max())
+    
+    # ¡Contraejemplos! (n sin ninguna representación)
+    resultados["no_cumple"] = ns[~cumple].tolist()
     
     resultados["tiempo"] = time.time() - inicio_tiempo
     
     return resultados
 
 
+def verificar_goldbach_fusionado(n_inicio, n_fin):
+    """
+    Criba y verifica Goldbach en una sola pasada (modo rápido, un proceso).
+    
+    Cada segmento de la criba se empaqueta en el mapa de bits y, mientras
+    sigue en caché, se verifican los n pares que contiene: para todo n del
+    segmento, n - p ≤ n ya está cribado. Así no hace falta cribar todo el
+    rango antes de empezar ni volver a leer la criba desde memoria.
+    
+    No calcula el mínimo ni el máximo de representaciones (se quedan en
+    inf y 0): para eso hace falta el mapa invertido completo.
+    
+    Args:
+        n_inicio: Primer n par a verificar
+        n_fin: Último n a verificar
+    
+    Yields:
+        Un diccionario por segmento, con el formato de verificar_goldbach_rango
+    """
+    if n_inicio % 2 != 0:
+        n_inicio += 1
+    
+    # Mapa de bits y array de primos reservados de una vez (π(x) < 1.26·x/ln x)
+    bits_primos = np.zeros(n_fin // 64 + 1, dtype=np.uint64)
+    primos = np.empty(int(1.26 * n_fin / math.log(max(n_fin, 3))) + 64, dtype=np.int64)
+    num_primos = 0
+    
+    inicio_tiempo = time.time()
+    
+    for inicio, segmento in _segmentos_criba(n_fin):
+        # Los segmentos empiezan en múltiplos de 64: palabras completas
+        palabras = empaquetar_mapa(segmento)
+        bits_primos[inicio >> 6:(inicio >> 6) + len(palabras)] = palabras
+        nuevos = np.flatnonzero(segmento) + inicio
+        primos[num_primos:num_primos + len(nuevos)] = nuevos
+        num_primos += len(nuevos)
+    
+        # inicio es par, así que los n pares del segmento arrancan en él
+        ns = np.arange(max(n_inicio, inicio), inicio + len(segmento), 2, dtype=np.int64)
+        if len(ns) == 0:
+            continue
+    
+        cumple = _cumple_goldbach(ns, primos[:num_primos], bits_primos)
+    
+        yield {
+            "rango": (int(ns[0]), int(ns[-1])),
+            "verificados": len(ns),
+            "cumple": int(np.count_nonzero(cumple)),
+            "no_cumple": ns[~cumple].tolist(),
+            "min_representaciones": float('inf'),
+            "max_representaciones": 0,
+            "tiempo": time.time() - inicio_tiempo
+        }
+        inicio_tiempo = time.time()
+
+
+def _inicializar_worker(descriptor_criba):
+    """
+    Prepara cada proceso del Pool antes de recibir batches.
+    
+    Instala la criba del proceso padre como criba global del worker. Con
+    fork ya está heredada (apunta a la memoria compartida); con spawn
+    (Windows/macOS) el worker se adjunta a la memoria compartida por nombre,
+    sin copiar los arrays.
+    
+    El paralelismo ya lo da el Pool: cada worker usa un solo hilo de Numba
+    para no sobresuscribir los cores.
+    
+    Args:
+        descriptor_criba: Valor devuelto por compartir_criba
+    """
+    if _criba["limite"] < descriptor_criba["limite"]:
+        _adjuntar_criba(descriptor_criba)
+    if NUMBA_DISPONIBLE and CONFIG["num_cores"] > 1:
+        numba.set_num_threads(1)
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # SISTEMA DE PERSISTENCIA (Guardado y recuperación)
 # ═══════════════════════════════════════════════════════════════════════════
 
+# Checkpoint binario: cabecera de tamaño fijo + lista acotada de contraejemplos
+# (magia, versión, último n, verificados, cumplen, total contraejemplos,
+#  tiempo total, inicio de sesión como timestamp, mínimo y máximo de
+#  representaciones (0 = sin datos), contraejemplos guardados)
+_CABECERA_PROGRESO = struct.Struct("<4sHQQQQddQQI")
+_MAGIA_PROGRESO = b"GBCK"
+_VERSION_PROGRESO = 2
+
+# Cabeceras de versiones anteriores que todavía se pueden leer
+_CABECERA_PROGRESO_V1 = struct.Struct("<4sHQQQQddI")
+_MAGIA_Y_VERSION = struct.Struct("<4sH")
+
+
+def _progreso_inicial():
+    """Estado de una verificación que empieza desde cero."""
+    return {
+        "ultimo_n_verificado": CONFIG["n_inicial"] - 2,
+        "total_verificados": 0,
+        "total_cumple": 0,
+        "total_contraejemplos": 0,
+        "contraejemplos": [],
+        "min_representaciones": 0,
+        "max_representaciones": 0,
+        "tiempo_total": 0,
+        "inicio_sesion": datetime.now().isoformat()
+    }
+
+
+def _leer_progreso_binario(ruta):
+    """
+    Lee un checkpoint escrito por guardar_progreso.
+    
+    Args:
+        ruta: Archivo de progreso binario
+        
+    Returns:
+        Diccionario con el estado del progreso
+    """
+    with open(ruta, 'rb') as f:
+        datos = f.read()
+    
+    magia, version = _MAGIA_Y_VERSION.unpack_from(datos)
+    if magia != _MAGIA_PROGRESO or version not in (1, _VERSION_PROGRESO):
+        raise ValueError(f"formato de progreso desconocido ({magia!r}, v{version})")
+    
+    if version == 1:
+        # v1 no guardaba estadísticas de representaciones
+        cabecera = _CABECERA_PROGRESO_V1
+        (_, _, ultimo_n, verificados, cumple, total_contraejemplos,
+         tiempo_total, inicio_sesion, guardados) = cabecera.unpack_from(datos)
+        min_representaciones = max_representaciones = 0
+    else:
+        cabecera = _CABECERA_PROGRESO
+        (_, _, ultimo_n, verificados, cumple, total_contraejemplos,
+         tiempo_total, inicio_sesion, min_representaciones, max_representaciones,
+         guardados) = cabecera.unpack_from(datos)
+    
+    contraejemplos = struct.unpack_from(f"<{guardados}Q", datos, cabecera.size)
+    return {
+        "ultimo_n_verificado": ultimo_n,
+        "total_verificados": verificados,
+        "total_cumple": cumple,
+        "total_contraejemplos": total_contraejemplos,
+        "contraejemplos": list(contraejemplos),
+        "min_representaciones": min_representaciones,
+        "max_representaciones": max_representaciones,
+        "tiempo_total": tiempo_total,
+        "inicio_sesion": datetime.fromtimestamp(inicio_sesion).isoformat()
+    }
+
+
+def _leer_progreso_legado(ruta):
+    """
+    Lee un checkpoint en el formato JSON anterior.
+    
+    Args:
+        ruta: Archivo de progreso JSON
+        
+    Returns:
+        Diccionario con el estado del progreso
+    """
+    with open(ruta, 'r') as f:
+        progreso = json.load(f)
+    progreso.setdefault("total_contraejemplos", len(progreso["contraejemplos"]))
+    progreso.setdefault("min_representaciones", 0)
+    progreso.setdefault("max_representaciones", 0)
+    progreso["contraejemplos"] = progreso["contraejemplos"][:CONFIG["max_contraejemplos"]]
+    return progreso
+
+
 def cargar_progreso():
     """
     Carga el progreso de una ejecución anterior (si existe).
     
     Esto permite reanudar la verificación si el programa fue interrumpido.
+    Si solo existe un progreso en el formato JSON anterior, se importa.
     
     Returns:
         Diccionario con el estado del progreso
     """
-    if os.path.exists(CONFIG["archivo_progreso"]):
+    for ruta, lector in ((CONFIG["archivo_progreso"], _leer_progreso_binario),
+                         (CONFIG["archivo_progreso_legado"], _leer_progreso_legado)):
+        if not os.path.exists(ruta):
+            continue
         try:
-            with open(CONFIG["archivo_progreso"], 'r') as f:
-                progreso = json.load(f)
-                escribir_log(f"📂 Progreso cargado desde {CONFIG['archivo_progreso']}")
-                escribir_log(f"   Último n verificado: {progreso['ultimo_n_verificado']:,}")
-                return progreso
+            progreso = lector(ruta)
+            escribir_log(f"📂 Progreso cargado desde {ruta}")
+            escribir_log(f"   Último n verificado: {progreso['ultimo_n_verificado']:,}")
+            return progreso
         except Exception as e:
             escribir_log(f"⚠️ Error al cargar progreso: {e}")
             escribir_log("   Iniciando desde el principio...")
+            break
     
-    return {
-        "ultimo_n_verificado": CONFIG["n_inicial"] - 2,
-        "total_verificados": 0,
-        "total_cumple": 0,
-        "contraejemplos": [],
-        "tiempo_total": 0,
-        "inicio_sesion": datetime.now().isoformat()
-    }
+    return _progreso_inicial()
 
 
 def guardar_progreso(progreso):
     """
-    Guarda el progreso actual en un archivo JSON.
+    Guarda el progreso actual en un archivo binario compacto.
+    
+    El checkpoint tiene tamaño acotado: solo escalares y como mucho
+    CONFIG["max_contraejemplos"] contraejemplos (la lista completa está en
+    CONFIG["archivo_contraejemplos"]). Se escribe en un archivo temporal y
+    se renombra con os.replace, que es atómico: un corte a mitad de
+    escritura nunca deja un checkpoint corrupto.
     
     Args:
         progreso: Diccionario con el estado actual
     """
+    contraejemplos = progreso["contraejemplos"][:CONFIG["max_contraejemplos"]]
     try:
-        with open(CONFIG["archivo_progreso"], 'w') as f:
-            json.dump(progreso, f, indent=2)
+        cabecera = _CABECERA_PROGRESO.pack(
+            _MAGIA_PROGRESO,
+            _VERSION_PROGRESO,
+            progreso["ultimo_n_verificado"],
+            progreso["total_verificados"],
+            progreso["total_cumple"],
+            progreso["total_contraejemplos"],
+            progreso["tiempo_total"],
+            datetime.fromisoformat(progreso["inicio_sesion"]).timestamp(),
+            progreso["min_representaciones"],
+            progreso["max_representaciones"],
+            len(contraejemplos)
+        )
+        temporal = CONFIG["archivo_progreso"] + ".tmp"
+        with open(temporal, 'wb') as f:
+            f.write(cabecera)
+            f.write(struct.pack(f"<{len(contraejemplos)}Q", *contraejemplos))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporal, CONFIG["archivo_progreso"])
     except Exception as e:
         escribir_log(f"❌ Error al guardar progreso: {e}")
 
 
+def registrar_contraejemplos(contraejemplos):
+    """
+    Añade contraejemplos al registro completo, uno por línea.
+    
+    El registro solo crece por el final y se escribe en cuanto se
+    encuentran, sin esperar al siguiente checkpoint. Si se reanuda desde un
+    checkpoint anterior, un mismo n puede aparecer más de una vez.
+    
+    Args:
+        contraejemplos: Lista de números pares sin representación
+    """
+    if not contraejemplos:
+        return
+    try:
+        with open(CONFIG["archivo_contraejemplos"], 'a', encoding='utf-8') as f:
+            f.write("".join(f"{n}\n" for n in contraejemplos))
+            f.flush()
+            os.fsync(f.fileno())
+    except Exception as e:
+        escribir_log(f"❌ Error al registrar contraejemplos {contraejemplos}: {e}")
+
+
 def escribir_log(mensaje):
     """
     Escribe un mensaje en el archivo de log y opcionalmente en pantalla.
@@ -314,6 +1137,14 @@ def generar_reporte(progreso):
         velocidad = 0
         tiempo_restante_str = "Calculando..."
     
+    # Mínimo y máximo de representaciones (solo si se han calculado)
+    if progreso["max_representaciones"] > 0:
+        estadisticas = (f"   • Representaciones por n (mín / máx): "
+                        f"{progreso['min_representaciones']:,} / "
+                        f"{progreso['max_representaciones']:,}\n")
+    else:
+        estadisticas = ""
+    
     # Construir reporte
     reporte = f"""
 ╔═══════════════════════════════════════════════════════════════╗
@@ -327,8 +1158,8 @@ def generar_reporte(progreso):
    
 ✅ RESULTADOS:
    • Cumplen Goldbach: {progreso['total_cumple']:,}
-   • Contraejemplos encontrados: {len(progreso['contraejemplos'])}
-   
+   • Contraejemplos encontrados: {progreso['total_contraejemplos']}
+{estadisticas}   
 ⏱️  TIEMPO:
    • Transcurrido: {tiempo_str}
    • Velocidad: {velocidad:.2f} números/segundo
@@ -351,6 +1182,68 @@ def generar_reporte(progreso):
 # FUNCIÓN PRINCIPAL
 # ═══════════════════════════════════════════════════════════════════════════
 
+def _rondas_en_paralelo(n_inicio):
+    """
+    Reparte la verificación en batches entre los procesos de un Pool.
+    
+    Criba UNA vez en el proceso padre y deja la criba en memoria compartida:
+    todos los workers leen la misma copia física.
+    
+    Args:
+        n_inicio: Primer n par a verificar
+        
+    Yields:
+        Una lista de resultados por ronda, ordenada por rango
+    """
+    inicio_criba = time.time()
+    obtener_primos_hasta(CONFIG["n_final"])
+    if CONFIG["contar_todas"]:
+        # La tabla FFT también se calcula una sola vez y se comparte
+        obtener_tabla_representaciones(min(CONFIG["n_final"], CONFIG["limite_fft"]))
+    tiempo_criba = time.time() - inicio_criba
+    # Sin referencias locales a los arrays: al compartirlos, la copia
+    # privada se libera y en el padre solo queda la de memoria compartida
+    descriptor_criba = compartir_criba()
+    escribir_log(f"🔢 Criba hasta {CONFIG['n_final']:,}: {len(_criba['primos']):,} primos "
+                 f"en {tiempo_criba:.2f}s")
+    
+    with Pool(processes=CONFIG["num_cores"], initializer=_inicializar_worker,
+              initargs=(descriptor_criba,)) as pool:
+        n_actual = n_inicio
+        
+        while n_actual <= CONFIG["n_final"]:
+            # Preparar batches para procesar en paralelo
+            batches = []
+            for _ in range(CONFIG["num_cores"] * CONFIG["batches_por_core"]):
+                if n_actual > CONFIG["n_final"]:
+                    break
+                
+                # n_fin_batch par: el siguiente batch empieza justo en
+                # n_fin_batch + 2 sin saltarse ningún número (y con
+                # tamaño_batch = 1 el batch tiene un solo n, no retrocede)
+                n_fin_batch = min(
+                    n_actual + 2 * max(0, CONFIG["tamaño_batch"] // 2 - 1), 
+                    CONFIG["n_final"]
+                )
+                batches.append((n_actual, n_fin_batch, False))
+                n_actual = n_fin_batch + 2
+            
+            if not batches:
+                break
+            
+            # Procesar batches en paralelo: cada worker toma el siguiente
+            # chunk en cuanto termina, sin esperar al batch más lento.
+            # Se ordenan al final para que ultimo_n_verificado solo avance
+            # cuando toda la ronda está completa.
+            yield sorted(
+                pool.imap_unordered(
+                    verificar_goldbach_rango, batches,
+                    chunksize=CONFIG["chunksize"]
+                ),
+                key=lambda resultado: resultado["rango"]
+            )
+
+
 def verificacion_masiva_goldbach():
     """
     Función principal que coordina toda la verificación masiva.
@@ -391,58 +1284,57 @@ def verificacion_masiva_goldbach():
     escribir_log(f"   • Intervalo de guardado: {CONFIG['intervalo_guardado']}s")
     escribir_log("")
     
+    # Con un solo core no hay Pool que alimentar: criba y verificación van
+    # fusionadas, segmento a segmento (sin estadísticas de representaciones).
+    # Si no, se criba una vez y se reparte
+    if (CONFIG["num_cores"] == 1 and not CONFIG["contar_todas"]
+            and not CONFIG["muestreo_estadisticas"]):
+        escribir_log("🔢 Criba y verificación fusionadas por segmentos (1 core)")
+        rondas = ([resultado] for resultado in
+                  verificar_goldbach_fusionado(n_inicio, CONFIG["n_final"]))
+    else:
+        rondas = _rondas_en_paralelo(n_inicio)
+    
     # Control de tiempo para guardado periódico
     ultimo_guardado = time.time()
     
-    # Crear pool de procesos
     try:
-        with Pool(processes=CONFIG["num_cores"]) as pool:
-            n_actual = n_inicio
-            
-            while n_actual <= CONFIG["n_final"]:
-                # Preparar batches para procesar en paralelo
-                batches = []
-                for _ in range(CONFIG["num_cores"]):
-                    if n_actual > CONFIG["n_final"]:
-                        break
-                    
-                    n_fin_batch = min(
-                        n_actual + CONFIG["tamaño_batch"] - 1, 
-                        CONFIG["n_final"]
+        for resultados in rondas:
+            # Consolidar resultados
+            for resultado in resultados:
+                progreso["total_verificados"] += resultado["verificados"]
+                progreso["total_cumple"] += resultado["cumple"]
+                registrar_contraejemplos(resultado["no_cumple"])
+                progreso["total_contraejemplos"] += len(resultado["no_cumple"])
+                # Lista acotada: el checkpoint no crece sin límite
+                hueco = CONFIG["max_contraejemplos"] - len(progreso["contraejemplos"])
+                progreso["contraejemplos"].extend(resultado["no_cumple"][:hueco])
+                progreso["ultimo_n_verificado"] = resultado["rango"][1]
+                progreso["tiempo_total"] += resultado["tiempo"]
+                if resultado["max_representaciones"] > 0:
+                    # min_representaciones = 0 significa "sin datos todavía"
+                    minimo = progreso["min_representaciones"] or resultado["min_representaciones"]
+                    progreso["min_representaciones"] = min(minimo, resultado["min_representaciones"])
+                    progreso["max_representaciones"] = max(
+                        progreso["max_representaciones"], resultado["max_representaciones"]
                     )
-                    batches.append((n_actual, n_fin_batch, False))
-                    n_actual = n_fin_batch + 2
-                
-                if not batches:
-                    break
-                
-                # Procesar batches en paralelo
-                resultados = pool.map(verificar_goldbach_rango, batches)
-                
-                # Consolidar resultados
-                for resultado in resultados:
-                    progreso["total_verificados"] += resultado["verificados"]
-                    progreso["total_cumple"] += resultado["cumple"]
-                    progreso["contraejemplos"].extend(resultado["no_cumple"])
-                    progreso["ultimo_n_verificado"] = resultado["rango"][1]
-                    progreso["tiempo_total"] += resultado["tiempo"]
+            
+            # Guardar periódicamente
+            tiempo_actual = time.time()
+            if tiempo_actual - ultimo_guardado >= CONFIG["intervalo_guardado"]:
+                guardar_progreso(progreso)
+                escribir_log(generar_reporte(progreso))
+                ultimo_guardado = tiempo_actual
                 
-                # Guardar periódicamente
-                tiempo_actual = time.time()
-                if tiempo_actual - ultimo_guardado >= CONFIG["intervalo_guardado"]:
-                    guardar_progreso(progreso)
-                    escribir_log(generar_reporte(progreso))
-                    ultimo_guardado = tiempo_actual
-                    
-                    # Si encontramos contraejemplos, reportar inmediatamente
-                    if progreso["contraejemplos"]:
-                        escribir_log("")
-                        escribir_log("🚨" * 20)
-                        escribir_log("¡CONTRAEJEMPLO(S) POTENCIAL(ES) ENCONTRADO(S)!")
-                        escribir_log(f"Valores: {progreso['contraejemplos']}")
-                        escribir_log("Continuando verificación para encontrar más...")
-                        escribir_log("🚨" * 20)
-                        escribir_log("")
+                # Si encontramos contraejemplos, reportar inmediatamente
+                if progreso["contraejemplos"]:
+                    escribir_log("")
+                    escribir_log("🚨" * 20)
+                    escribir_log("¡CONTRAEJEMPLO(S) POTENCIAL(ES) ENCONTRADO(S)!")
+                    escribir_log(f"Valores: {progreso['contraejemplos']}")
+                    escribir_log("Continuando verificación para encontrar más...")
+                    escribir_log("🚨" * 20)
+                    escribir_log("")
     
     except KeyboardInterrupt:
         escribir_log("\n⏸️  Verificación interrumpida por el usuario.")
@@ -456,6 +1348,11 @@ def verificacion_masiva_goldbach():
         escribir_log("   Progreso guardado hasta el último punto exitoso.")
         raise
     
+    finally:
+        # Cerrar el generador termina el Pool en el acto, no al recolectarlo
+        rondas.close()
+        liberar_criba_compartida()
+    
     # Guardado final
     guardar_progreso(progreso)
     escribir_log("\n" + "="*65)
@@ -489,7 +1386,7 @@ def main():
 ║     • Guardado automático cada {} segundos             ║
 ║                                                               ║
 ║  💾 Archivos que se generarán:                                ║
-║     • progreso_goldbach.json (estado actual)                  ║
+║     • progreso_goldbach.bin (estado actual)                   ║
 ║     • log_goldbach.txt (historial detallado)                  ║
 ║                                                               ║
 ║  ⚠️  ADVERTENCIA:                                             ║
@@ -531,7 +1428,7 @@ def main():
         print("📈 ESTADÍSTICAS FINALES:")
         print(f"   • Total verificados: {resultado['total_verificados']:,}")
         print(f"   • Cumplen Goldbach: {resultado['total_cumple']:,}")
-        print(f"   • Contraejemplos: {len(resultado['contraejemplos'])}")
+        print(f"   • Contraejemplos: {resultado['total_contraejemplos']}")
         print(f"   • Tiempo total: {timedelta(seconds=int(resultado['tiempo_total']))}")
         print("="*65)
         